@@ -1,3 +1,5 @@
+import os
+from functools import lru_cache
 from pathlib import Path
 
 BASE_SAVE_DIR = Path.home() / "Documents/save_repos/"
@@ -5,7 +7,21 @@ BASE_SAVE_DIR = Path.home() / "Documents/save_repos/"
 BASE_GITHUB_API = "https://api.github.com/repos/{}/{}"
 GITHUB_GRAPHQL = "https://api.github.com/graphql"
 
+GRAPHQL_CACHE_NAME = "diffetl_graphql"
+GRAPHQL_CACHE_EXPIRE = 3600
+GITHUB_RATE_LIMIT_MIN_REMAINING = 10
 
+GIT_COMMAND_TIMEOUT = 600
+GIT_MAX_CONCURRENT_CLONES = 8
+GIT_COMMIT_CACHE_SIZE = 4096
+
+TRANSFORM_MAX_WORKERS = os.cpu_count() or 1
+TRANSFORM_CHUNK_SIZE = 16
+TRANSFORM_MIN_PARALLEL_BATCH = 256
+DIFF_MAX_WORKERS = TRANSFORM_MAX_WORKERS * 2
+
+
+@lru_cache(maxsize=1024)
 def get_repo_dir(repo_url: str) -> Path:
     repo_name = repo_url.strip().rstrip("/").split("/")[-1].replace(".git", "")
-    return Path(BASE_SAVE_DIR / repo_name)
+    return BASE_SAVE_DIR / repo_name
@@ -1,8 +1,10 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional, Tuple
+from typing import Dict, List, Optional, Tuple
 
 from git import Commit as GitCommit
 
+from diffetl.extract._raw import CommitCursor, RawNumStat
+
 
 class GitClient(ABC):
     @abstractmethod
@@ -16,3 +18,11 @@ class GitClient(ABC):
     def list_commits(
         self, batch_size: int, branch: str, **kwargs
     ) -> Tuple[List[GitCommit], Optional[str]]: ...
+
+    @abstractmethod
+    def list_commits_page(
+        self, batch_size: int, branch: str, cursor: Optional[CommitCursor] = None
+    ) -> Tuple[List[GitCommit], CommitCursor]: ...
+
+    @abstractmethod
+    def list_numstats(self, shas: List[str]) -> Dict[str, Dict[str, RawNumStat]]: ...
@@ -5,19 +5,32 @@ from uuid import UUID
 from git import Commit as GitCommit
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class SourceInfo:
     repo_url: str
     branch: str
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class ExtractMetadata:
     batch_id: UUID
     load_timestamp: datetime
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class RawCommit:
     git_commit: GitCommit
     extract_metadata: ExtractMetadata
+
+
+@dataclass(frozen=True, slots=True)
+class CommitCursor:
+    tip_sha: str
+    offset: int
+
+
+@dataclass(frozen=True, slots=True)
+class RawNumStat:
+    lines_added: int
+    lines_removed: int
+    is_binary: bool
@@ -8,7 +8,7 @@ from git import Commit as GitCommit
 from diffetl.extract._raw import ExtractMetadata, RawCommit, SourceInfo
 
 
-@dataclass
+@dataclass(slots=True)
 class RawCommitsBatch:
     load_id: UUID
     load_timestamp: datetime
@@ -19,14 +19,13 @@ class RawCommitsBatch:
     error: Optional[str] = None
 
     def add_commits(self, git_commits: List[GitCommit]):
-        for gc in git_commits:
-            raw_commit = RawCommit(
-                git_commit=gc,
-                extract_metadata=ExtractMetadata(
-                    batch_id=self.load_id, load_timestamp=self.load_timestamp
-                ),
-            )
-            self.raw_commits.append(raw_commit)
+        extract_metadata = ExtractMetadata(
+            batch_id=self.load_id, load_timestamp=self.load_timestamp
+        )
+        self.raw_commits.extend(
+            RawCommit(git_commit=gc, extract_metadata=extract_metadata)
+            for gc in git_commits
+        )
 
     def validate(self, expected: int, actual: int):
         if expected != actual:
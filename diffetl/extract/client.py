@@ -1,15 +1,59 @@
+import asyncio
+import hashlib
+import time
 import urllib.parse
 from abc import abstractmethod
-from typing import Dict, Iterator, List, Optional, Tuple
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 
-import requests
 from git import Commit as GitCommit
 from git import Repo
-
-from diffetl.config import GITHUB_GRAPHQL, get_repo_dir
+from requests import Response
+from requests_cache import CachedSession, FileCache
+
+from diffetl.config import (
+    GIT_COMMAND_TIMEOUT,
+    GIT_COMMIT_CACHE_SIZE,
+    GIT_MAX_CONCURRENT_CLONES,
+    GITHUB_GRAPHQL,
+    GITHUB_RATE_LIMIT_MIN_REMAINING,
+    GRAPHQL_CACHE_EXPIRE,
+    GRAPHQL_CACHE_NAME,
+    get_repo_dir,
+)
 from diffetl.extract._client import GitClient
+from diffetl.extract._raw import CommitCursor, RawNumStat
 from diffetl.extract.graphql.queries.issue import build_issue_query
 from diffetl.extract.graphql.queries.pr import build_pr_query
+from diffetl.extract.graphql.queries.repository import build_repo_query
+from diffetl.utils import parse_numstat
+
+_COMMIT_MARKER = "__COMMIT__ "
+
+# connection -> (cursor variable, @include variable)
+_REPO_QUERY_CONNECTIONS: Dict[str, Tuple[str, Optional[str]]] = {
+    "pullRequests": ("prCursor", "withPrs"),
+    "issues": ("issueCursor", "withIssues"),
+}
+
+
+async def _run_git(*args: str, timeout: float = GIT_COMMAND_TIMEOUT) -> None:
+    proc = await asyncio.create_subprocess_exec(
+        "git",
+        *args,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+    )
+    try:
+        _, stderr = await asyncio.wait_for(proc.communicate(), timeout=timeout)
+    except asyncio.TimeoutError:
+        proc.kill()
+        await proc.wait()
+        raise RuntimeError(f"git {' '.join(args)} timed out after {timeout}s") from None
+
+    if proc.returncode != 0:
+        raise RuntimeError(f"git {' '.join(args)} failed: {stderr.decode().strip()}")
 
 
 class LocalGitClient(GitClient):
@@ -17,6 +61,8 @@ class LocalGitClient(GitClient):
         self.repo_url = repo_url
         self._cloned = False
         self.repo = None
+        self._commit_cache: OrderedDict[str, GitCommit] = OrderedDict()
+        self._resume_offsets: Dict[Tuple[str, str], int] = {}
 
     def _clone(self):
         if not self._cloned:
@@ -32,6 +78,24 @@ class LocalGitClient(GitClient):
                 self.repo = Repo.clone_from(self.repo_url, str(repo_dir))
         self._cloned = True
 
+    async def _clone_async(self) -> None:
+        if self._cloned:
+            return
+
+        repo_dir = get_repo_dir(self.repo_url)
+
+        # Opening the repository and is_dirty() run git synchronously, so they
+        # go to a thread to keep the other clones moving.
+        if repo_dir.exists():
+            self.repo = await asyncio.to_thread(Repo, str(repo_dir))
+            if not await asyncio.to_thread(self.repo.is_dirty):
+                await _run_git("-C", str(repo_dir), "pull", "origin")
+        else:
+            repo_dir.parent.mkdir(parents=True, exist_ok=True)
+            await _run_git("clone", self.repo_url, str(repo_dir))
+            self.repo = await asyncio.to_thread(Repo, str(repo_dir))
+        self._cloned = True
+
     def list_commits(
         self, batch_size: int, branch: str, **kwargs
     ) -> Tuple[List[GitCommit], Optional[str]]:
@@ -39,23 +103,132 @@ class LocalGitClient(GitClient):
         if not self.repo:
             raise RuntimeError("Init repo failed.")
 
-        iterator_gc = self.repo.iter_commits(branch)
-        batch = []
         last_sha = kwargs.get("last_sha")
-        skip = last_sha is not None
+        offset = 0
+
+        if last_sha is not None:
+            resume_offset = self._resume_offset(branch, last_sha)
+            if resume_offset is None:
+                return [], None
+            offset = resume_offset
 
-        for gc in iterator_gc:
-            if skip:
-                if gc.hexsha == last_sha:
-                    skip = False
-                continue
-            batch.append(gc)
-            if len(batch) == batch_size:
-                break
+        batch = self._pool_commits(
+            self.repo.iter_commits(branch, max_count=batch_size, skip=offset)
+        )
 
         new_last_sha = batch[-1].hexsha if batch else None
+        if new_last_sha is not None:
+            self._resume_offsets[(branch, new_last_sha)] = offset + len(batch)
         return batch, new_last_sha
 
+    def _resume_offset(self, branch: str, last_sha: str) -> Optional[int]:
+        # The page after ``last_sha`` starts right behind it in the branch walk.
+        # Reuse the offset recorded for the previous page if ``last_sha`` is
+        # still at that position, otherwise locate it in the walk.
+        offset = self._resume_offsets.pop((branch, last_sha), None)
+        if offset is not None:
+            sha_at = self.repo.git.rev_list(branch, max_count=1, skip=offset - 1)
+            if sha_at == last_sha:
+                return offset
+
+        for position, sha in enumerate(self.repo.git.rev_list(branch).splitlines()):
+            if sha == last_sha:
+                return position + 1
+        return None
+
+    def list_commits_page(
+        self, batch_size: int, branch: str, cursor: Optional[CommitCursor] = None
+    ) -> Tuple[List[GitCommit], CommitCursor]:
+        self._clone()
+        if not self.repo:
+            raise RuntimeError("Init repo failed.")
+
+        tip_sha = self.repo.commit(branch).hexsha
+        offset = 0
+
+        if cursor is not None:
+            if cursor.tip_sha != tip_sha:
+                raise ValueError(
+                    f"Stale cursor: {branch} moved from {cursor.tip_sha} to {tip_sha}"
+                )
+            offset = cursor.offset
+
+        # Walking from the pinned tip keeps offsets stable between pages.
+        batch = self._pool_commits(
+            self.repo.iter_commits(tip_sha, max_count=batch_size, skip=offset)
+        )
+        return batch, CommitCursor(tip_sha=tip_sha, offset=offset + len(batch))
+
+    def get_commit(self, sha: str) -> GitCommit:
+        cached = self._commit_cache.get(sha)
+        if cached is not None:
+            self._commit_cache.move_to_end(sha)
+            return cached
+
+        self._clone()
+        if not self.repo:
+            raise RuntimeError("Init repo failed.")
+
+        return self._pool_commits([self.repo.commit(sha)])[0]
+
+    def _pool_commits(self, commits: Iterable[GitCommit]) -> List[GitCommit]:
+        # Commits seen on earlier pages are handed out again, so their lazily
+        # loaded headers are not read back from the object database.
+        pooled = []
+
+        for gc in commits:
+            cached = self._commit_cache.get(gc.hexsha)
+            if cached is None:
+                self._commit_cache[gc.hexsha] = cached = gc
+            else:
+                self._commit_cache.move_to_end(gc.hexsha)
+            pooled.append(cached)
+
+        while len(self._commit_cache) > GIT_COMMIT_CACHE_SIZE:
+            self._commit_cache.popitem(last=False)
+
+        return pooled
+
+    def list_numstats(self, shas: List[str]) -> Dict[str, Dict[str, RawNumStat]]:
+        self._clone()
+        if not self.repo:
+            raise RuntimeError("Init repo failed.")
+
+        numstats: Dict[str, Dict[str, RawNumStat]] = {sha: {} for sha in shas}
+        if not shas:
+            return numstats
+
+        # One `git log` for the whole batch instead of a `git diff` per commit.
+        # Merges are diffed against their first parent, like `Diff.to_diff`.
+        output = self.repo.git.log(
+            "--no-walk=unsorted",
+            "--numstat",
+            "-M",
+            "-z",
+            "-m",
+            "--first-parent",
+            f"--format={_COMMIT_MARKER}%H",
+            *shas,
+        )
+
+        for chunk in output.split(_COMMIT_MARKER)[1:]:
+            sha, _, body = chunk.partition("\0")
+            numstats[sha.strip()] = parse_numstat(body)
+
+        return numstats
+
+
+async def gather_clones(
+    clients: Iterable[LocalGitClient], limit: int = GIT_MAX_CONCURRENT_CLONES
+) -> None:
+    semaphore = asyncio.Semaphore(limit)
+
+    async def _bounded_clone(client: LocalGitClient) -> None:
+        async with semaphore:
+            await client._clone_async()
+
+    await asyncio.gather(*(_bounded_clone(client) for client in clients))
+
 
 class APIClient:
     def __init__(self, repo_url: str, token: Optional[str] = None) -> None:
@@ -88,7 +261,21 @@ class APIClient:
 class GithubGraphQLClient(APIClient):
     def __init__(self, repo_url: str, token: Optional[str] = None) -> None:
         super().__init__(repo_url, token)
-        self.session = requests.Session()
+        # GraphQL is POST-only, so POST has to be cacheable; the JSON body
+        # (query + variables, including the cursor) is part of the cache key.
+        # Authorization is redacted from cached requests and never part of the
+        # key, so every token gets its own cache instead.
+        token_digest = hashlib.sha256((token or "").encode()).hexdigest()[:16]
+        self.session = CachedSession(
+            backend=FileCache(
+                f"{GRAPHQL_CACHE_NAME}_{token_digest}",
+                use_cache_dir=True,
+                serializer="json",
+            ),
+            allowable_methods=("GET", "POST"),
+            expire_after=GRAPHQL_CACHE_EXPIRE,
+            stale_if_error=True,
+        )
         self.session.headers.update({"Authorization": f"Bearer {token}"})
 
     def _query(self, query: str, variables=None):
@@ -96,6 +283,7 @@ class GithubGraphQLClient(APIClient):
             GITHUB_GRAPHQL, json={"query": query, "variables": variables or {}}
         )
         resp.raise_for_status()
+        self._wait_for_rate_limit(resp)
         payload = resp.json()
 
         if "errors" in payload:
@@ -103,25 +291,67 @@ class GithubGraphQLClient(APIClient):
 
         return payload["data"]
 
-    def _paginate_repository_connection(
-        self, *, query: str, connection: str, variables: Dict
-    ) -> Iterator[Dict]:
-        cursor = None
-
-        while True:
-            variables["cursor"] = cursor
+    def _wait_for_rate_limit(self, resp: Response) -> None:
+        if resp.from_cache:
+            return
 
-            data = self._query(query, variables)
-            conn_data = data["repository"][connection]
+        remaining = resp.headers.get("X-RateLimit-Remaining")
+        reset_at = resp.headers.get("X-RateLimit-Reset")
 
-            yield from conn_data["nodes"]
+        if remaining is None or reset_at is None:
+            return
+        if int(remaining) < GITHUB_RATE_LIMIT_MIN_REMAINING:
+            time.sleep(max(0.0, int(reset_at) - time.time()))
 
-            page = conn_data["pageInfo"]
-
-            if not page["hasNextPage"]:
-                break
+    def _paginate_repository_connection(
+        self, *, query: str, connection: str, variables: Dict
+    ) -> Iterator[Dict]:
+        return self._paginate_repository_connections(
+            query=query, connections={connection: ("cursor", None)}, variables=variables
+        )
 
-            cursor = page["endCursor"]
+    def _paginate_repository_connections(
+        self,
+        *,
+        query: str,
+        connections: Dict[str, Tuple[str, Optional[str]]],
+        variables: Dict,
+    ) -> Iterator[Dict]:
+        # Cursors are opaque, so pages can't be requested out of order; instead
+        # the next page is requested in the background as soon as the current
+        # one has arrived, before its nodes are handed out. Pages are buffered
+        # whole: the cached session reads the full body anyway to store it.
+        # Connections share a request and are dropped via @include once done.
+        active = set(connections)
+        page_variables = {**variables}
+        for cursor_var, _ in connections.values():
+            page_variables[cursor_var] = None
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            future = executor.submit(self._query, query, page_variables)
+
+            while future is not None:
+                repository = future.result()["repository"]
+                future = None
+                pages = {
+                    name: repository[name] for name in connections if name in active
+                }
+
+                for name, page in pages.items():
+                    page_info = page["pageInfo"]
+                    cursor_var, include_var = connections[name]
+                    if page_info["hasNextPage"]:
+                        page_variables[cursor_var] = page_info["endCursor"]
+                    else:
+                        active.discard(name)
+                        if include_var is not None:
+                            page_variables[include_var] = False
+
+                if active:
+                    future = executor.submit(self._query, query, {**page_variables})
+
+                for page in pages.values():
+                    yield from page["nodes"]
 
     def fetch_pull_requests(
         self, prs_first: int = 50, comments_first: int = 50
@@ -140,3 +370,12 @@ class GithubGraphQLClient(APIClient):
             connection="issues",
             variables={"owner": self.owner, "repo": self.repo_name},
         )
+
+    def fetch_pull_requests_and_issues(
+        self, prs_first: int = 50, issues_first: int = 50, comments_first: int = 50
+    ) -> Iterator[Dict]:
+        return self._paginate_repository_connections(
+            query=build_repo_query(prs_first, issues_first, comments_first),
+            connections=_REPO_QUERY_CONNECTIONS,
+            variables={"owner": self.owner, "repo": self.repo_name},
+        )
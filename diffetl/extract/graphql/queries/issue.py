@@ -1,8 +1,11 @@
+from functools import lru_cache
+
 from diffetl.extract.graphql.fragments.actor import ACTOR_FIELDS
 from diffetl.extract.graphql.fragments.comments import COMMENTS_FIELDS
 from diffetl.extract.graphql.fragments.issue import ISSUE_CORE
 
 
+@lru_cache(maxsize=32)
 def build_issue_query(issues_first: int = 50, comments_first: int = 20):
     return "\n".join(
         [
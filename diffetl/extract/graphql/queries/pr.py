@@ -1,3 +1,5 @@
+from functools import lru_cache
+
 from diffetl.extract.graphql.fragments.actor import ACTOR_FIELDS
 from diffetl.extract.graphql.fragments.comments import COMMENTS_FIELDS
 from diffetl.extract.graphql.fragments.git_refs import PULL_REQUEST_REFS
@@ -5,6 +7,7 @@ from diffetl.extract.graphql.fragments.pr import PULL_REQUEST_CORE
 from diffetl.extract.graphql.fragments.repository import REPOSITORY_REF_FIELDS
 
 
+@lru_cache(maxsize=32)
 def build_pr_query(prs_first: int = 50, comments_first: int = 20) -> str:
     return "\n".join(
         [
@@ -0,0 +1,72 @@
+from functools import lru_cache
+
+from diffetl.extract.graphql.fragments.actor import ACTOR_FIELDS
+from diffetl.extract.graphql.fragments.comments import COMMENTS_FIELDS
+from diffetl.extract.graphql.fragments.git_refs import PULL_REQUEST_REFS
+from diffetl.extract.graphql.fragments.issue import ISSUE_CORE
+from diffetl.extract.graphql.fragments.pr import PULL_REQUEST_CORE
+from diffetl.extract.graphql.fragments.repository import REPOSITORY_REF_FIELDS
+
+
+@lru_cache(maxsize=32)
+def build_repo_query(
+    prs_first: int = 50, issues_first: int = 50, comments_first: int = 20
+) -> str:
+    return "\n".join(
+        [
+            ACTOR_FIELDS,
+            REPOSITORY_REF_FIELDS,
+            COMMENTS_FIELDS,
+            PULL_REQUEST_CORE,
+            PULL_REQUEST_REFS,
+            ISSUE_CORE,
+            f"""
+            query(
+                $owner: String!,
+                $repo: String!,
+                $prCursor: String,
+                $issueCursor: String,
+                $withPrs: Boolean = true,
+                $withIssues: Boolean = true
+            ) {{
+                repository(owner: $owner, name: $repo) {{
+                    pullRequests(first: {prs_first}, after: $prCursor)
+                        @include(if: $withPrs) {{
+                        pageInfo {{
+                            hasNextPage
+                            endCursor
+                        }}
+                        nodes {{
+                            __typename
+                            ...PullRequestRefs
+                            ...PullRequestCore
+
+                            comments(first: {comments_first}) {{
+                                nodes {{
+                                    ...PRCommentFields
+                                }}
+                            }}
+                        }}
+                    }}
+                    issues(first: {issues_first}, after: $issueCursor)
+                        @include(if: $withIssues) {{
+                        pageInfo {{
+                            hasNextPage
+                            endCursor
+                        }}
+                        nodes {{
+                            __typename
+                            ...IssueCore
+
+                            comments(first: {comments_first}) {{
+                                nodes {{
+                                    ...PRCommentFields
+                                }}
+                            }}
+                        }}
+                    }}
+                }}
+            }}
+            """,
+        ]
+    )
@@ -1,24 +1,47 @@
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
-from typing import Optional
+from typing import Dict, List, Optional, Self, Tuple
 from uuid import uuid4
 
+from diffetl.config import (
+    TRANSFORM_CHUNK_SIZE,
+    TRANSFORM_MAX_WORKERS,
+    TRANSFORM_MIN_PARALLEL_BATCH,
+    get_repo_dir,
+)
 from diffetl.extract._client import GitClient
-from diffetl.extract._raw import SourceInfo
+from diffetl.extract._raw import CommitCursor, RawNumStat, SourceInfo
 from diffetl.extract.batch import RawCommitsBatch
+from diffetl.transform.commit import (
+    Commit,
+    CommitElement,
+    CommitMetadata,
+    _init_worker,
+    _load_worker_commit,
+)
+from diffetl.transform.diff import Diff
+
+
+def _create_linked_element(
+    sha: str,
+    numstat: Dict[str, RawNumStat],
+    branches: Tuple[str, ...],
+    tags: Tuple[str, ...],
+) -> CommitElement:
+    git_commit, commit = _load_worker_commit(sha, branches, tags)
+    return CommitElement(commit=commit, diff=Diff.to_diff(git_commit, numstat))
 
 
 class LocalGitRepository:
-    def __init__(self, git_client: GitClient):
+    def __init__(self, git_client: GitClient, max_workers: int = TRANSFORM_MAX_WORKERS):
         self.git_client = git_client
+        self.max_workers = max_workers
+        self._executor: Optional[ProcessPoolExecutor] = None
 
     def extract_commits_batch(
         self, batch_size: int, branch: str, last_sha: Optional[str] = None
     ):
-        raw_commits_batch = RawCommitsBatch(
-            load_id=uuid4(),
-            load_timestamp=datetime.now(),
-            source_info=SourceInfo(repo_url=self.git_client.repo_url, branch=branch),
-        )
+        raw_commits_batch = self._new_batch(branch)
         try:
             list_raw_commits, new_last_sha = self.git_client.list_commits(
                 batch_size, branch, last_sha=last_sha
@@ -31,3 +54,90 @@ class LocalGitRepository:
         except Exception as e:
             raw_commits_batch.mark_failed(str(e))
             return raw_commits_batch, last_sha
+
+    def extract_commits_page(
+        self, batch_size: int, branch: str, cursor: Optional[CommitCursor] = None
+    ):
+        raw_commits_batch = self._new_batch(branch)
+        try:
+            list_raw_commits, new_cursor = self.git_client.list_commits_page(
+                batch_size, branch, cursor
+            )
+            raw_commits_batch.add_commits(list_raw_commits)
+            raw_commits_batch.validate(
+                expected=batch_size, actual=len(list_raw_commits)
+            )
+            return raw_commits_batch, new_cursor
+        except Exception as e:
+            raw_commits_batch.mark_failed(str(e))
+            return raw_commits_batch, cursor
+
+    def load_diffs_for_batch(self, shas: List[str]) -> Dict[str, Dict[str, RawNumStat]]:
+        return self.git_client.list_numstats(shas)
+
+    def fetch_commits(
+        self, batch_size: int, branch: str, last_sha: Optional[str] = None
+    ) -> Dict[str, CommitElement]:
+        raw_commits_batch, _ = self.extract_commits_batch(batch_size, branch, last_sha)
+        return self._create_linked_elements(raw_commits_batch)
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _create_linked_elements(
+        self, raw_commits_batch: RawCommitsBatch
+    ) -> Dict[str, CommitElement]:
+        git_commits = [rc.git_commit for rc in raw_commits_batch.raw_commits]
+        if not git_commits:
+            return {}
+
+        shas = [gc.hexsha for gc in git_commits]
+        numstats = self.load_diffs_for_batch(shas)
+        # Refreshed per batch, so branches and tags moved since the last one
+        # are seen.
+        branch_map, tag_map = CommitMetadata.cached_ref_index(git_commits[0].repo)
+
+        if len(shas) < TRANSFORM_MIN_PARALLEL_BATCH:
+            return CommitElement.to_group_dict(
+                [
+                    CommitElement(
+                        commit=Commit.from_git_commit(gc, branch_map, tag_map),
+                        diff=Diff.to_diff(gc, numstats[gc.hexsha]),
+                    )
+                    for gc in git_commits
+                ]
+            )
+
+        # Building a commit is mostly Python-side parsing, so large batches are
+        # spread over worker processes; each one opens the repository once.
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                initializer=_init_worker,
+                initargs=(str(get_repo_dir(self.git_client.repo_url)),),
+            )
+
+        elements = self._executor.map(
+            _create_linked_element,
+            shas,
+            [numstats[sha] for sha in shas],
+            [branch_map.get(sha, ()) for sha in shas],
+            [tag_map.get(sha, ()) for sha in shas],
+            chunksize=TRANSFORM_CHUNK_SIZE,
+        )
+        return CommitElement.to_group_dict(list(elements))
+
+    def _new_batch(self, branch: str) -> RawCommitsBatch:
+        return RawCommitsBatch(
+            load_id=uuid4(),
+            load_timestamp=datetime.now(),
+            source_info=SourceInfo(repo_url=self.git_client.repo_url, branch=branch),
+        )
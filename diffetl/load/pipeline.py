@@ -1,7 +1,7 @@
-from typing import Optional
+from typing import Any, Dict, Optional
 from diffetl.extract.client import GitHubClient
 from diffetl.extract.repository import LocalGitRepository
-from diffetl.transform.commit import CommitElement, CommitGraph
+from diffetl.transform.commit import CommitElement, CommitGraph, CommitTable
 from diffetl.transform.diff import Diff, DiffElement
 from diffetl.transform.groups import CommitGroup
 
@@ -12,20 +12,19 @@ def print_history(commit_element: CommitElement, graph: CommitGraph, depth=0):
     for parent in graph.iter_parents(commit_element):
         print_history(parent, graph, depth + 1)
 
-def print_diff(diff: Optional[Diff], depth=0):
+def print_diff(diff: Optional[Diff], stats: Dict[str, Any], depth=0):
     if diff is None:
         print("No diff available")
         return
 
     indent = "  " * depth
-    stats = diff.get_aggregated_stats()
     
     print(f"{indent}Diff for commit: {diff.commit_hexsha}")
     print(f"{indent}Stats:")
-    print(f"{indent} Files changed : {stats.files_changed}")
-    print(f"{indent} Lines added   : {stats.lines_added}")
-    print(f"{indent} Lines removed : {stats.lines_removed}")
-    print(f"{indent} Hunks count   : {stats.hunks_count}")
+    print(f"{indent} Files changed : {stats['files_changed']}")
+    print(f"{indent} Lines added   : {stats['lines_added']}")
+    print(f"{indent} Lines removed : {stats['lines_removed']}")
+    print(f"{indent} Hunks count   : {stats['hunks_count']}")
 
     
     for element in diff.get_root_elements():
@@ -43,8 +42,8 @@ def print_diff_element(element: DiffElement, depth=0):
 
 
 client = GitHubClient("https://github.com/yegor256/awesome-cfp")
-repo = LocalGitRepository(client)
-commits = repo.fetch_commits(50, "master")
+with LocalGitRepository(client) as repo:
+    commits = repo.fetch_commits(50, "master")
 
 graph = CommitGraph(list(commits.values()))
 
@@ -54,7 +53,11 @@ b = group.by_author(commits)
 first_commit = next(iter(commits.values())) 
 print_history(first_commit, graph)
 
-for commit in commits.values():
-    print_diff(commit.diff)
+table = CommitTable.from_elements(list(commits.values()))
+for index, commit in enumerate(commits.values()):
+    print_diff(commit.diff, table.row(index))
     print("-" * 40)
+
+print(f"Total lines added   : {table.sum('lines_added')}")
+print(f"Total lines removed : {table.sum('lines_removed')}")
     
\ No newline at end of file
@@ -1,8 +1,8 @@
 import mimetypes
 import re
 from enum import Enum
-from functools import lru_cache
-from typing import Dict, Final, List, Optional
+from functools import cache, lru_cache
+from typing import Dict, Final, List, Optional, Tuple
 
 from git import Commit as GitCommit
 
@@ -58,6 +58,13 @@ _MAIN_BRANCH_NAMES: Final = ("main", "master", "prod", "production")
 _LOST_BRANCH_NAMES: Final = ("zombie", "lost", "abandoned", "ghost")
 
 
+_TEST_DIRS: Final = frozenset(p.strip("/") for p in _TEST_PATHS)
+_DOC_DIRS: Final = frozenset(p.strip("/") for p in _DOC_PATHS)
+_DOC_TOP_DIRS: Final = frozenset(p.strip("/") for p in _DOC_PREFIXES)
+_BUILD_DIRS: Final = frozenset(p.strip("/") for p in _BUILD_PATHS)
+_BUILD_FILES_RE: Final = re.compile("|".join(re.escape(f) for f in _BUILD_FILES))
+
+
 class DiffType(Enum):
     COMMIT = "commit"
     FILE = "file"
@@ -76,16 +83,22 @@ class ChangeType(Enum):
 
     @classmethod
     def from_git_flag(cls, flag: str) -> Optional["ChangeType"]:
-        mapping = {
-            "A": cls.ADDED,
-            "D": cls.REMOVED,
-            "M": cls.MODIFIED,
-            "R": cls.RENAMED,
-            "C": cls.COPIED,
-            "T": cls.TYPE_CHANGED,
-            "U": cls.UNCHANGED,
-        }
-        return mapping.get(flag.upper(), None)
+        return _GIT_FLAG_MAP.get(flag)
+
+
+_GIT_FLAG_MAP: Final[Dict[str, ChangeType]] = {
+    key: change_type
+    for flag, change_type in (
+        ("A", ChangeType.ADDED),
+        ("D", ChangeType.REMOVED),
+        ("M", ChangeType.MODIFIED),
+        ("R", ChangeType.RENAMED),
+        ("C", ChangeType.COPIED),
+        ("T", ChangeType.TYPE_CHANGED),
+        ("U", ChangeType.UNCHANGED),
+    )
+    for key in (flag, flag.lower())
+}
 
 
 class FileType(Enum):
@@ -102,60 +115,78 @@ class FileType(Enum):
     UNKNOWN = "unknown"
 
     @classmethod
-    @lru_cache(maxsize=1024)
+    @lru_cache(maxsize=65536)
     def from_path_to_content(cls, file_path: Optional[str]) -> "FileType":
         if not file_path:
             return cls.UNKNOWN
 
         path_lower = file_path.lower()
-
-        if cls._is_test_file(path_lower):
+        # "a/b/c/name" -> top "a", dirs ["b", "c"]; "/x/" substring checks
+        # are membership tests on dirs, "x/" prefix checks on top.
+        segments = path_lower.split("/")
+        name = segments[-1]
+        top = segments[0] if len(segments) > 1 else ""
+        dirs = segments[1:-1]
+        dot = name.rfind(".")
+        suffix_type = _SUFFIX_TO_FILETYPE.get(name[dot:]) if dot >= 0 else None
+
+        if cls._is_test_file(path_lower, dirs, name):
             return cls.TEST
-        if cls._is_documentation(path_lower):
+        if suffix_type is cls.DOCUMENTATION or cls._is_documentation(top, dirs, name):
             return cls.DOCUMENTATION
-        if cls._is_build_file(path_lower):
+        if cls._is_build_file(path_lower, dirs):
             return cls.BUILD
-        if cls._is_config_file(path_lower):
+        if suffix_type is cls.CONFIG:
             return cls.CONFIG
-        if cls._is_data_file(path_lower):
+        if cls._is_data_file(top, dirs):
             return cls.DATA
 
-        mime_type, _ = mimetypes.guess_type(file_path)
+        # mimetypes only looks at the last extension, and the one before it
+        # when the last is an encoding such as ".gz", so only those key the
+        # cache; hashed or versioned stems do not add entries. A colon makes
+        # mimetypes split off a URL scheme, so such names keep the full chain.
+        name = file_path.rpartition("/")[2]
+        first_dot = name.find(".", len(name) - len(name.lstrip(".")))
+        extensions = name[first_dot:] if first_dot >= 0 else ""
+        if ":" not in extensions:
+            last_dot = extensions.rfind(".")
+            if extensions[last_dot:] in mimetypes.encodings_map:
+                last_dot = extensions.rfind(".", 0, last_dot)
+            extensions = extensions[max(last_dot, 0) :]
+        return cls._from_extensions(extensions)
+
+    @classmethod
+    @lru_cache(maxsize=4096)
+    def _from_extensions(cls, extensions: str) -> "FileType":
+        mime_type, _ = mimetypes.guess_type(f"file{extensions}")
         if mime_type:
-            return cls._from_mime_type(mime_type, path_lower)
+            return cls._from_mime_type(mime_type, extensions)
 
         return cls.UNKNOWN
 
     @classmethod
-    def _is_test_file(cls, path: str) -> bool:
+    def _is_test_file(cls, path: str, dirs: List[str], name: str) -> bool:
         return (
-            any(p in path for p in _TEST_PATHS)
-            or any(path.startswith(prefix) for prefix in _TEST_PREFIXES)
-            or path.endswith(_TEST_SUFFIXES)
+            not _TEST_DIRS.isdisjoint(dirs)
+            or path.startswith(_TEST_PREFIXES)
+            or name.endswith(_TEST_SUFFIXES)
         )
 
     @classmethod
-    def _is_documentation(cls, path: str) -> bool:
+    def _is_documentation(cls, top: str, dirs: List[str], name: str) -> bool:
         return (
-            any(p in path for p in _DOC_PATHS)
-            or any(path.startswith(prefix) for prefix in _DOC_PREFIXES)
-            or path.endswith(_DOC_SUFFIXES)
-            or any(path.endswith(f) for f in _DOC_FILES)
-        )
-
-    @classmethod
-    def _is_build_file(cls, path: str) -> bool:
-        return any(p in path for p in _BUILD_PATHS) or any(
-            f in path for f in _BUILD_FILES
+            top in _DOC_TOP_DIRS
+            or not _DOC_DIRS.isdisjoint(dirs)
+            or name.endswith(_DOC_FILES)
         )
 
     @classmethod
-    def _is_config_file(cls, path: str) -> bool:
-        return path.endswith(_CONFIG_EXTS)
+    def _is_build_file(cls, path: str, dirs: List[str]) -> bool:
+        return not _BUILD_DIRS.isdisjoint(dirs) or bool(_BUILD_FILES_RE.search(path))
 
     @classmethod
-    def _is_data_file(cls, path: str) -> bool:
-        return "/data/" in path or path.startswith("data/")
+    def _is_data_file(cls, top: str, dirs: List[str]) -> bool:
+        return top == "data" or "data" in dirs
 
     @classmethod
     def _from_mime_type(cls, mime_type: str, path: str) -> "FileType":
@@ -185,6 +216,12 @@ class FileType(Enum):
         return cls.UNKNOWN
 
 
+_SUFFIX_TO_FILETYPE: Final[Dict[str, FileType]] = {
+    **dict.fromkeys(_DOC_SUFFIXES, FileType.DOCUMENTATION),
+    **dict.fromkeys(_CONFIG_EXTS, FileType.CONFIG),
+}
+
+
 class BranchType(Enum):
     MAIN = "main"
     DEVELOPMENT = "development"
@@ -200,40 +237,38 @@ class BranchType(Enum):
     OTHER = "other"
 
     @classmethod
-    @lru_cache(maxsize=128)
+    @cache
     def from_branch_name(cls, branch_name: str) -> "BranchType":
-        name = branch_name.strip().lower()
-
-        if name in _MAIN_BRANCH_NAMES:
-            return cls.MAIN
-        elif name in _DEV_BRANCH_NAMES:
-            return cls.DEVELOPMENT
-
-        if name.startswith(_FEAT_BRANCH_NAMES):
-            return cls.FEATURE
-
-        if name.startswith(_FIX_BRANCH_NAMES):
-            return cls.FIX
-
-        if name.startswith("release"):
-            return cls.RELEASE
-
-        if name.startswith(_TEST_BRANCH_NAMES):
-            return cls.TEST
-
-        if name.startswith("dependabot/"):
-            return cls.DEPENDABOT
-        elif name.startswith("renovate/"):
-            return cls.RENOVATE
-        elif name.startswith("semaphore/"):
-            return cls.SEMAPHORE
-        elif name.startswith("github-actions/"):
-            return cls.GITHUB_ACTIONS
-
-        if any(lost_word in name for lost_word in _LOST_BRANCH_NAMES):
-            return cls.LOST
+        match = _BRANCH_MASTER_RE.match(branch_name.strip().lower())
+        return cls[match.lastgroup] if match else cls.OTHER
+
+
+def _alternation(names: Tuple[str, ...]) -> str:
+    return "|".join(map(re.escape, names))
+
+
+# Order matters: the first alternative that matches decides the type.
+_BRANCH_PATTERNS: Final[Tuple[Tuple[BranchType, str], ...]] = (
+    (BranchType.MAIN, rf"(?:{_alternation(_MAIN_BRANCH_NAMES)})\Z"),
+    (BranchType.DEVELOPMENT, rf"(?:{_alternation(_DEV_BRANCH_NAMES)})\Z"),
+    (BranchType.FEATURE, _alternation(_FEAT_BRANCH_NAMES)),
+    (BranchType.FIX, _alternation(_FIX_BRANCH_NAMES)),
+    (BranchType.RELEASE, "release"),
+    (BranchType.TEST, _alternation(_TEST_BRANCH_NAMES)),
+    (BranchType.DEPENDABOT, "dependabot/"),
+    (BranchType.RENOVATE, "renovate/"),
+    (BranchType.SEMAPHORE, "semaphore/"),
+    (BranchType.GITHUB_ACTIONS, "github-actions/"),
+    (BranchType.LOST, rf".*?(?:{_alternation(_LOST_BRANCH_NAMES)})"),
+)
 
-        return cls.OTHER
+_BRANCH_MASTER_RE: Final = re.compile(
+    "|".join(
+        f"(?P<{branch_type.name}>{pattern})"
+        for branch_type, pattern in _BRANCH_PATTERNS
+    ),
+    re.DOTALL,
+)
 
 
 class BotType(Enum):
@@ -244,40 +279,44 @@ class BotType(Enum):
     PRE_COMMIT_CI = "pre-commit-ci"
     RULTOR = "rultor"
 
-    @classmethod
-    def _get_patterns(cls) -> Dict["BotType", List[re.Pattern]]:
-        return {
-            cls.DEPENDABOT: [
-                re.compile(r"dependabot(\[bot\])?"),
-                re.compile(r"dependabot@"),
-            ],
-            cls.RENOVATE: [re.compile(r"renovate"), re.compile(r"renovate-bot@")],
-            cls.GITHUB_ACTIONS: [
-                re.compile(r"github-actions"),
-                re.compile(r"actions@github.com"),
-            ],
-            cls.SEMAPHORE: [re.compile(r"semaphore"), re.compile(r"semaphoreci@")],
-            cls.PRE_COMMIT_CI: [re.compile(r"pre\-commit\-ci\[bot\]")],
-            cls.RULTOR: [re.compile(r"@rultor\.com$"), re.compile(r"^rultor@")],
-        }
-
     @classmethod
     def detect(cls, commit: GitCommit) -> Optional["BotType"]:
-        name = (commit.author.name or "").lower()
-        email = (commit.author.email or "").lower()
+        author = commit.author
+        name = (author.name or "").lower()
+        email = (author.email or "").lower()
 
-        patterns = cls._get_patterns()
+        if _BOT_MASTER_RE.search(name) is None and _BOT_MASTER_RE.search(email) is None:
+            return None
 
-        for bot_type, regex_list in patterns.items():
-            if any(
-                re.search(pattern, name) or re.search(pattern, email)
-                for pattern in regex_list
-            ):
+        # Several bots can match; the first one in _BOT_PATTERNS wins.
+        for bot_type, pattern in _BOT_TYPE_RES:
+            if pattern.search(name) is not None or pattern.search(email) is not None:
                 return bot_type
 
         return None
 
 
+_BOT_PATTERNS: Final[Tuple[Tuple[BotType, Tuple[str, ...]], ...]] = (
+    (BotType.DEPENDABOT, (r"dependabot(\[bot\])?", r"dependabot@")),
+    (BotType.RENOVATE, (r"renovate", r"renovate-bot@")),
+    (BotType.GITHUB_ACTIONS, (r"github-actions", r"actions@github.com")),
+    (BotType.SEMAPHORE, (r"semaphore", r"semaphoreci@")),
+    (BotType.PRE_COMMIT_CI, (r"pre\-commit\-ci\[bot\]",)),
+    (BotType.RULTOR, (r"@rultor\.com$", r"^rultor@")),
+)
+
+_BOT_MASTER_RE: Final = re.compile(
+    "|".join(
+        f"(?P<{bot_type.name}>{'|'.join(patterns)})"
+        for bot_type, patterns in _BOT_PATTERNS
+    )
+)
+
+_BOT_TYPE_RES: Final = tuple(
+    (bot_type, re.compile("|".join(patterns))) for bot_type, patterns in _BOT_PATTERNS
+)
+
+
 class PRState(Enum):
     OPEN = "open"
     CLOSED = "closed"
@@ -1,5 +1,6 @@
 import re
-from typing import Final, TypedDict, Union
+from functools import lru_cache
+from typing import Final, NamedTuple, Union
 
 _CONVENTIONAL_COMMIT_TYPES: Final = [
     "feat",
@@ -15,56 +16,61 @@ _CONVENTIONAL_COMMIT_TYPES: Final = [
     "revert",
 ]
 _FORBIDDEN_WORDS: Final = ["WIP", "TODO", "FIXME", "TEMP", "DEBUG", "HACK", "XXX"]
+_FORBIDDEN_SET: Final = frozenset(w.lower() for w in _FORBIDDEN_WORDS)
+_COMMIT_PATTERN: Final = re.compile(
+    r"\s*(" + "|".join(_CONVENTIONAL_COMMIT_TYPES) + r")"
+    r"(\([a-zA-Z0-9\-_]+\))?"
+    r"!?:"
+    r"\s+\S",
+    re.IGNORECASE,
+)
+_WORD_PATTERN: Final = re.compile(r"\w+")
+_CACHED_MESSAGE_MAX_LENGTH: Final = 4096
 
 
-class ValidationResult(TypedDict):
+class ValidationResult(NamedTuple):
     message_is_not_empty: bool
     message_is_conventional: bool
     message_is_within_length: bool
     message_has_forbidden_words: bool
 
 
+_EMPTY_MESSAGE_RESULT: Final = ValidationResult(
+    message_is_not_empty=False,
+    message_is_conventional=False,
+    message_is_within_length=False,
+    message_has_forbidden_words=False,
+)
+
+
 class MessageQualityAssessor:
-    def __init__(self, max_length_commit: int = 72):
-        self._commit_pattern = re.compile(
-            r"^(" + "|".join(_CONVENTIONAL_COMMIT_TYPES) + r")"
-            r"(\([a-zA-Z0-9\-_]+\))?"
-            r"!?:"
-            r"\s+"
-            r".+",
-            re.IGNORECASE,
-        )
+    __slots__ = ("_max_length_commit",)
 
-        self._forbidden_pattern = re.compile(
-            r"\b(" + "|".join(_FORBIDDEN_WORDS) + r")\b", re.IGNORECASE
-        )
+    def __init__(self, max_length_commit: int = 72):
         self._max_length_commit = max_length_commit
 
     def validate_message(
         self, message: Union[str, bytes, bytearray, memoryview]
     ) -> ValidationResult:
-        if isinstance(message, (bytes, bytearray, memoryview)):
-            if isinstance(message, memoryview):
-                message = message.tobytes().decode("utf-8")
-            else:
-                message = message.decode("utf-8")
+        if not isinstance(message, str):
+            message = bytes(message).decode("utf-8", errors="replace")
+
+        if not message or message.isspace():
+            return _EMPTY_MESSAGE_RESULT
+
+        if len(message) > _CACHED_MESSAGE_MAX_LENGTH:
+            return _validate.__wrapped__(message, self._max_length_commit)
 
-        is_not_empty = bool(message and not message.isspace())
-        is_conventional = (
-            bool(self._commit_pattern.match(message.strip())) if is_not_empty else False
-        )
-        is_within_length = (
-            len(message) <= self._max_length_commit if is_not_empty else False
-        )
-        has_forbidden_words = (
-            bool(self._forbidden_pattern.search(message)) if is_not_empty else False
-        )
+        return _validate(message, self._max_length_commit)
 
-        validation_result: ValidationResult = {
-            "message_is_not_empty": is_not_empty,
-            "message_is_conventional": is_conventional,
-            "message_is_within_length": is_within_length,
-            "message_has_forbidden_words": has_forbidden_words,
-        }
 
-        return validation_result
+@lru_cache(maxsize=8192)
+def _validate(message: str, max_length_commit: int) -> ValidationResult:
+    return ValidationResult(
+        message_is_not_empty=True,
+        message_is_conventional=bool(_COMMIT_PATTERN.match(message)),
+        message_is_within_length=len(message) <= max_length_commit,
+        message_has_forbidden_words=not _FORBIDDEN_SET.isdisjoint(
+            _WORD_PATTERN.findall(message.lower())
+        ),
+    )
@@ -1,5 +1,19 @@
 from abc import ABC, abstractmethod
-from typing import ClassVar, Generic, Iterator, List, Type, TypeVar, Union, overload
+from collections import defaultdict
+from typing import (
+    Any,
+    ClassVar,
+    DefaultDict,
+    Dict,
+    Generic,
+    Iterator,
+    List,
+    Optional,
+    Type,
+    TypeVar,
+    Union,
+    overload,
+)
 
 from diffetl.extract.client import APIClient
 from diffetl.transform.issue import IssueElement
@@ -9,25 +23,41 @@ T = TypeVar("T")
 
 
 class BaseCollection(Generic[T], ABC):
+    __slots__ = ("_raw", "_elements", "_authors_index", "_fetched")
+
     _element_class: ClassVar[Type]
 
     def __init__(self) -> None:
-        self._elements: List[T] = []
+        self._raw: List[Optional[dict]] = []
+        self._elements: List[Optional[T]] = []
+        self._authors_index: Dict[str, List[int]] = {}
         self._fetched = False
 
     def _fetch_elements(self, client: APIClient, state: str) -> None:
         if not self._fetched:
-            raw_data = self._fetch_raw_data(client, state)
-            for raw in raw_data:
-                element = self._element_class.from_dict(raw)
-                self._elements.append(element)
+            self._raw.extend(self._fetch_raw_data(client, state))
+            self._elements = [None] * len(self._raw)
+
+            authors_index: DefaultDict[str, List[int]] = defaultdict(list)
+            for i, raw in enumerate(self._raw):
+                authors_index[raw["user"]["login"]].append(i)
+            self._authors_index = dict(authors_index)
+
             self._fetched = True
 
+    def _materialize(self, index: int) -> T:
+        element = self._elements[index]
+        if element is None:
+            element = self._element_class.from_dict(self._raw[index])
+            self._elements[index] = element
+            self._raw[index] = None
+        return element
+
     def __len__(self) -> int:
         return len(self._elements)
 
     def __iter__(self) -> Iterator[T]:
-        return iter(self._elements)
+        return map(self._materialize, range(len(self._elements)))
 
     @overload
     def __getitem__(self, index: int) -> T: ...
@@ -36,7 +66,16 @@ class BaseCollection(Generic[T], ABC):
     def __getitem__(self, index: slice) -> List[T]: ...
 
     def __getitem__(self, index: Union[int, slice]) -> Union[T, List[T]]:
-        return self._elements[index]
+        if isinstance(index, slice):
+            return [
+                self._materialize(i) for i in range(*index.indices(len(self._elements)))
+            ]
+        return self._materialize(index)
+
+    def filter_by_author(self, author_name: Optional[str]) -> Iterator[T]:
+        if not author_name:
+            return iter(())
+        return map(self._materialize, self._authors_index.get(author_name, ()))
 
     @classmethod
     def fetch_all(cls, client: APIClient, state: str = "all") -> "BaseCollection[T]":
@@ -49,13 +88,31 @@ class BaseCollection(Generic[T], ABC):
 
 
 class PullRequestCollection(BaseCollection[PullRequestElement]):
+    __slots__ = ()
+
     _element_class = PullRequestElement
 
     def _fetch_raw_data(self, client: APIClient, state: str) -> Iterator[dict]:
         return client.fetch_pull_requests(state)
 
+    def to_columns(self) -> Dict[str, List[Any]]:
+        prs = list(self)
+        return {
+            "pr_number": [pr.ref.number for pr in prs],
+            "created_at": [pr.created_at for pr in prs],
+            "merged_at": [pr.merged_at for pr in prs],
+            "closed_at": [pr.closed_at for pr in prs],
+            "state": [pr.state.value for pr in prs],
+            "target_branch": [pr.target_branch for pr in prs],
+            "source_branch": [pr.source_branch for pr in prs],
+            "author_name": [pr.author.name for pr in prs],
+            "is_fork": [pr.ref.is_fork for pr in prs],
+        }
+
 
 class IssueCollection(BaseCollection[IssueElement]):
+    __slots__ = ()
+
     _element_class = IssueElement
 
     def _fetch_raw_data(self, client: APIClient, state: str) -> Iterator[dict]:
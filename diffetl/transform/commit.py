@@ -1,136 +1,179 @@
+from collections import Counter, defaultdict
 from collections.abc import Iterator
-from dataclasses import asdict, dataclass
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
 from datetime import UTC, datetime
-from typing import TYPE_CHECKING, Any, Dict, List, Optional, Self, Sequence
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    ClassVar,
+    DefaultDict,
+    Dict,
+    Final,
+    List,
+    Optional,
+    Self,
+    Sequence,
+    Tuple,
+)
+from weakref import WeakValueDictionary
 
 from git import Commit as GitCommit
+from git import Repo
 
+from diffetl.config import TRANSFORM_MAX_WORKERS
 from diffetl.transform._enum import BotType, BranchType
-from diffetl.transform.assessor import MessageQualityAssessor
+from diffetl.transform.assessor import MessageQualityAssessor, ValidationResult
 
 if TYPE_CHECKING:
     from diffetl.transform.diff import Diff
 
 
-@dataclass(frozen=True, slots=True)
+@dataclass(frozen=True, slots=True, weakref_slot=True)
 class Author:
     name: str | None
     email: str | None
 
+    _pool: ClassVar[WeakValueDictionary] = WeakValueDictionary()
 
-class CommitMetadata:
-    __slots__ = ("_commit", "branches", "tags", "custom_attributes")
+    @classmethod
+    def get(cls, name: str | None, email: str | None) -> "Author":
+        key = (name, email)
+        author = cls._pool.get(key)
+        if author is None:
+            author = cls(name=name, email=email)
+            cls._pool[key] = author
+        return author
+
+    def __reduce__(self):
+        return Author.get, (self.name, self.email)
+
+
+RefMap = Dict[str, Tuple[str, ...]]
+
+# git_dir -> (for-each-ref snapshot, (branch_map, tag_map))
+_REF_INDEX_CACHE: Dict[str, Tuple[str, Tuple[RefMap, RefMap]]] = {}
+
+_BOT_BRANCH_TYPES: Final = frozenset(
+    (
+        BranchType.DEPENDABOT,
+        BranchType.RENOVATE,
+        BranchType.SEMAPHORE,
+        BranchType.GITHUB_ACTIONS,
+    )
+)
 
-    def __init__(self, git_commit: GitCommit) -> None:
-        self._commit: GitCommit = git_commit
+_STATS_COLUMNS: Final = ("lines_added", "lines_removed", "files_changed", "hunks_count")
 
-        self.branches: List[str] = self._get_branches()
-        self.tags: List[str] = self._get_tags()
+
+class CommitMetadata:
+    __slots__ = (
+        "branches",
+        "tags",
+        "branch_types",
+        "has_lost_branch",
+        "bot_type",
+        "is_bot",
+        "message_quality",
+        "custom_attributes",
+    )
+
+    def __init__(
+        self, git_commit: GitCommit, branch_map: RefMap, tag_map: RefMap
+    ) -> None:
+        self.branches: Tuple[str, ...] = branch_map.get(git_commit.hexsha, ())
+        self.tags: Tuple[str, ...] = tag_map.get(git_commit.hexsha, ())
 
         self.custom_attributes: Dict[str, Any] = {}
 
         self._add_branch_types()
-        self._detect_bot_commit()
-        self._check_quality_message()
+        self._detect_bot_commit(git_commit)
+        self._check_quality_message(git_commit)
 
     def to_dict(self):
-        ca = self.custom_attributes
-
         return {
             "branches": self.branches,
             "tags": self.tags,
-            "is_bot": ca.get("is_bot_related", False),
-            "bot_type": ca.get("bot_type"),
-            "has_lost_branch": ca.get("has_lost_branch", False),
-            "branch_types": ca.get("branch_types", []),
-            "message_is_not_empty": ca.get("message_is_not_empty", None),
-            "message_is_conventional": ca.get("message_is_conventional", None),
-            "message_is_within_length": ca.get("message_is_within_length", None),
-            "message_has_forbidden_words": ca.get("message_has_forbidden_words", None),
+            "is_bot": self.is_bot,
+            "bot_type": self.bot_type.value if self.bot_type else None,
+            "has_lost_branch": self.has_lost_branch,
+            "branch_types": [bt.value for bt in self.branch_types],
+            **self.message_quality._asdict(),
+        }
+
+    @property
+    def branch_summary(self) -> Dict[str, int]:
+        counts = Counter(self.branch_types)
+        return {
+            f"branch_count_{bt.value}": counts[bt] for bt in BranchType if bt in counts
         }
 
     def add_custom_attribute(self, key: str, value: Any) -> None:
         self.custom_attributes[key] = value
 
-    def _add_branch_types(self):
-        branch_types = [BranchType.from_branch_name(b) for b in self.branches]
-
-        type_counts = {}
-        for bt in BranchType:
-            count = sum(1 for t in branch_types if t == bt)
-            if count > 0:
-                type_counts[f"branch_count_{bt.value}"] = count
-
-        self.add_custom_attribute("branch_types", [bt.value for bt in branch_types])
-        self.add_custom_attribute("branch_summary", type_counts)
-        self.add_custom_attribute("has_lost_branch", BranchType.LOST in branch_types)
-
-    def _detect_bot_commit(self) -> None:
-        is_bot_branch = any(
-            t
-            in (
-                BranchType.DEPENDABOT,
-                BranchType.RENOVATE,
-                BranchType.SEMAPHORE,
-                BranchType.GITHUB_ACTIONS,
-            )
-            for t in [BranchType.from_branch_name(b) for b in self.branches]
+    def _add_branch_types(self) -> None:
+        self.branch_types: Tuple[BranchType, ...] = tuple(
+            BranchType.from_branch_name(b) for b in self.branches
         )
+        self.has_lost_branch = BranchType.LOST in self.branch_types
 
-        bot_type = BotType.detect(self._commit)
-
-        self.add_custom_attribute("is_bot_related", is_bot_branch or bool(bot_type))
-        self.add_custom_attribute("bot_type", bot_type.value if bot_type else None)
+    def _detect_bot_commit(self, git_commit: GitCommit) -> None:
+        self.bot_type: Optional[BotType] = BotType.detect(git_commit)
+        self.is_bot = self.bot_type is not None or not _BOT_BRANCH_TYPES.isdisjoint(
+            self.branch_types
+        )
 
-    def _check_quality_message(self) -> None:
+    def _check_quality_message(self, git_commit: GitCommit) -> None:
         assessor = MessageQualityAssessor()
-        validation_result = assessor.validate_message(self._commit.message)
-
-        for k, v in validation_result.items():
-            self.add_custom_attribute(k, v)
-
-    def _get_branches(self) -> List[str]:
-        repo = self._commit.repo
-        commit_hexsha = self._commit.hexsha
-
-        branches = set()
+        self.message_quality: ValidationResult = assessor.validate_message(
+            git_commit.message
+        )
 
+    @staticmethod
+    def cached_ref_index(repo: Repo) -> Tuple[RefMap, RefMap]:
+        # The index only changes when a branch or tag moves, so one
+        # for-each-ref decides whether the index built last time still holds.
         try:
-            if not repo.head.is_detached:
-                current_branch = repo.active_branch.name
-                if commit_hexsha in [
-                    c.hexsha for c in repo.iter_commits(current_branch)
-                ]:
-                    branches.add(current_branch)
+            refs = repo.git.for_each_ref(
+                "--format=%(objectname) %(refname)", "refs/heads", "refs/tags"
+            )
         except Exception:
-            return []
+            return {}, {}
 
-        try:
-            result = repo.git.branch("--contains", commit_hexsha)
-            for line in result.split("\n"):
-                line = line.strip()
-                if line and not line.startswith("* "):
-                    branches.add(line)
-        except Exception:
-            return []
+        cached = _REF_INDEX_CACHE.get(repo.git_dir)
+        if cached is not None and cached[0] == refs:
+            return cached[1]
 
-        return list(branches) if branches else []
+        ref_index = CommitMetadata.build_ref_index(repo)
+        _REF_INDEX_CACHE[repo.git_dir] = (refs, ref_index)
+        return ref_index
 
-    def _get_tags(self) -> List[str]:
-        tags = set()
-        repo = self._commit.repo
-        commit_hexsha = self._commit.hexsha
+    @staticmethod
+    def build_ref_index(repo: Repo) -> Tuple[RefMap, RefMap]:
+        branch_map: DefaultDict[str, List[str]] = defaultdict(list)
+        tag_map: DefaultDict[str, List[str]] = defaultdict(list)
 
         try:
-            result = repo.git.tag("--points-at", commit_hexsha)
-            for tag_name in result.split("\n"):
-                tag_name = tag_name.strip()
-                if tag_name:
-                    tags.add(tag_name)
+            heads = repo.git.for_each_ref("--format=%(refname)", "refs/heads")
+            for refname in heads.splitlines():
+                branch = refname.removeprefix("refs/heads/")
+                for hexsha in repo.git.rev_list(refname).splitlines():
+                    branch_map[hexsha].append(branch)
+
+            # Annotated tags point at a tag object; %(*objectname) is the commit.
+            tags = repo.git.for_each_ref(
+                "--format=%(objectname) %(*objectname) %(refname)", "refs/tags"
+            )
+            for line in tags.splitlines():
+                objectname, peeled, refname = line.split(" ", 2)
+                tag_map[peeled or objectname].append(refname.removeprefix("refs/tags/"))
         except Exception:
-            return []
+            return {}, {}
 
-        return list(tags) if tags else []
+        return (
+            {hexsha: tuple(names) for hexsha, names in branch_map.items()},
+            {hexsha: tuple(names) for hexsha, names in tag_map.items()},
+        )
 
 
 @dataclass(frozen=True, slots=True)
@@ -139,19 +182,28 @@ class Commit:
     message: str
     author: Author
     created_at: datetime
-    parents_hexsha: Sequence[str]
+    parents_hexsha: Tuple[str, ...]
 
     metadata: CommitMetadata
 
     @classmethod
-    def from_git_commit(cls, git_commit: GitCommit) -> Self:
-        metadata = CommitMetadata(git_commit)
+    def from_git_commit(
+        cls,
+        git_commit: GitCommit,
+        branch_map: Optional[RefMap] = None,
+        tag_map: Optional[RefMap] = None,
+    ) -> Self:
+        if branch_map is None or tag_map is None:
+            branch_map, tag_map = CommitMetadata.cached_ref_index(git_commit.repo)
+
+        metadata = CommitMetadata(git_commit, branch_map, tag_map)
+        author = git_commit.author
         return cls(
             hexsha=git_commit.hexsha,
             message=str(git_commit.message).strip(),
-            author=Author(name=git_commit.author.name, email=git_commit.author.email),
+            author=Author.get(author.name, author.email),
             created_at=datetime.fromtimestamp(git_commit.committed_date, UTC),
-            parents_hexsha=[p.hexsha for p in git_commit.parents],
+            parents_hexsha=tuple(p.hexsha for p in git_commit.parents),
             metadata=metadata,
         )
 
@@ -167,13 +219,68 @@ class Commit:
         }
 
 
+_worker_repo: Optional[Repo] = None
+
+
+def _init_worker(repo_path: str) -> None:
+    global _worker_repo
+    _worker_repo = Repo(repo_path)
+
+
+def _load_worker_commit(
+    hexsha: str, branches: Tuple[str, ...], tags: Tuple[str, ...]
+) -> Tuple[GitCommit, Commit]:
+    # Only this commit's refs cross the pipe, not the whole index.
+    git_commit = _worker_repo.commit(hexsha)
+    commit = Commit.from_git_commit(git_commit, {hexsha: branches}, {hexsha: tags})
+    return git_commit, commit
+
+
+def _build_commit(
+    hexsha: str, branches: Tuple[str, ...], tags: Tuple[str, ...]
+) -> Commit:
+    return _load_worker_commit(hexsha, branches, tags)[1]
+
+
+def build_commits_parallel(
+    hexshas: Sequence[str], repo_path: str, n_workers: int = TRANSFORM_MAX_WORKERS
+) -> List[Commit]:
+    if not hexshas:
+        return []
+
+    branch_map, tag_map = CommitMetadata.build_ref_index(Repo(repo_path))
+
+    with ProcessPoolExecutor(
+        max_workers=n_workers,
+        initializer=_init_worker,
+        initargs=(repo_path,),
+    ) as executor:
+        return list(
+            executor.map(
+                _build_commit,
+                hexshas,
+                [branch_map.get(h, ()) for h in hexshas],
+                [tag_map.get(h, ()) for h in hexshas],
+                chunksize=max(1, len(hexshas) // (4 * n_workers)),
+            )
+        )
+
+
 @dataclass(frozen=True, slots=True)
 class CommitElement:
     commit: Commit
     diff: Optional["Diff"] = None
+    _hash: int = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "_hash", hash(self.commit.hexsha))
 
     def __hash__(self) -> int:
-        return hash(self.commit.hexsha)
+        return self._hash
+
+    def __reduce__(self):
+        # str hashes are salted per process, so recompute on unpickling.
+        return CommitElement, (self.commit, self.diff)
 
     def __eq__(self, value: object) -> bool:
         if isinstance(value, CommitElement):
@@ -193,7 +300,7 @@ class CommitElement:
 
         if self.diff:
             stats = self.diff.get_aggregated_stats()
-            data.update(asdict(stats))
+            data.update(stats.to_dict())
 
         return data
 
@@ -225,3 +332,63 @@ class CommitGraph:
 
     def iter_parents(self, element: CommitElement) -> Iterator[CommitElement]:
         return element.iter_parents(self._commit_map)
+
+
+class CommitTable:
+    __slots__ = ("_columns", "_length")
+
+    def __init__(self, columns: Dict[str, List[Any]]) -> None:
+        lengths = {len(values) for values in columns.values()}
+        if len(lengths) > 1:
+            raise ValueError("All columns must have the same length")
+
+        self._columns = columns
+        self._length = lengths.pop() if lengths else 0
+
+    @classmethod
+    def from_elements(cls, elements: Sequence[CommitElement]) -> Self:
+        # Same columns as CommitElement.to_dict(), filled straight from the
+        # fields instead of building a dict per row and transposing.
+        commits = [e.commit for e in elements]
+        metadata = [c.metadata for c in commits]
+        stats = [e.diff.get_aggregated_stats() if e.diff else None for e in elements]
+
+        columns: Dict[str, List[Any]] = {
+            "hexsha": [c.hexsha for c in commits],
+            "message": [c.message for c in commits],
+            "author_name": [c.author.name for c in commits],
+            "author_email": [c.author.email for c in commits],
+            "created_at": [c.created_at.isoformat() for c in commits],
+            "parents_hexsha": [c.parents_hexsha for c in commits],
+            "branches": [m.branches for m in metadata],
+            "tags": [m.tags for m in metadata],
+            "is_bot": [m.is_bot for m in metadata],
+            "bot_type": [m.bot_type.value if m.bot_type else None for m in metadata],
+            "has_lost_branch": [m.has_lost_branch for m in metadata],
+            "branch_types": [[bt.value for bt in m.branch_types] for m in metadata],
+        }
+        for index, name in enumerate(ValidationResult._fields):
+            columns[name] = [m.message_quality[index] for m in metadata]
+        for name in _STATS_COLUMNS:
+            columns[name] = [getattr(st, name) if st else None for st in stats]
+
+        return cls(columns)
+
+    def __len__(self) -> int:
+        return self._length
+
+    @property
+    def column_names(self) -> List[str]:
+        return list(self._columns)
+
+    def column(self, name: str) -> List[Any]:
+        return self._columns[name]
+
+    def row(self, index: int) -> Dict[str, Any]:
+        return {name: values[index] for name, values in self._columns.items()}
+
+    def sum(self, name: str) -> int:
+        return sum(value for value in self._columns[name] if value is not None)
+
+    def to_columns(self) -> Dict[str, List[Any]]:
+        return {name: values.copy() for name, values in self._columns.items()}
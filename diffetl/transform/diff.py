@@ -1,66 +1,53 @@
+import threading
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from typing import Iterator, List, Optional, Self, Sequence, Union
+from typing import (
+    DefaultDict,
+    Dict,
+    Final,
+    Iterator,
+    List,
+    Optional,
+    Self,
+    Sequence,
+    Tuple,
+    Union,
+)
 
 from git import Commit as GitCommit
 from git import Diff as GitDiff
+from git import Repo
 
+from diffetl.config import DIFF_MAX_WORKERS
+from diffetl.extract._raw import RawNumStat
 from diffetl.transform._enum import ChangeType, DiffType, FileType
 from diffetl.transform.file import FileMetadata
-from diffetl.utils import is_binary_file
+from diffetl.utils import parse_numstat
+
+_EMPTY_NUMSTAT: Final = RawNumStat(lines_added=0, lines_removed=0, is_binary=False)
 
 
 class DiffStats:
     __slots__ = (
-        "diff_item",
         "lines_added",
         "lines_removed",
         "files_changed",
         "hunks_count",
     )
 
-    def __init__(self, diff_item: GitDiff):
-        self.diff_item = diff_item
-        self.lines_added, self.lines_removed = self._calculate_lines_stats()
+    def __init__(self, numstat: RawNumStat):
+        self.lines_added = numstat.lines_added
+        self.lines_removed = numstat.lines_removed
         self.files_changed = 1
 
-        is_binary = is_binary_file(diff_item)
         self.hunks_count = (
             1
-            if (self.lines_added > 0 or self.lines_removed > 0) and not is_binary
+            if (self.lines_added > 0 or self.lines_removed > 0)
+            and not numstat.is_binary
             else 0
         )
 
-    def _calculate_lines_stats(self) -> tuple[int, int]:
-        try:
-            a_content = (
-                self.diff_item.a_blob.data_stream.read().decode(
-                    "utf-8", errors="ignore"
-                )
-                if self.diff_item.a_blob
-                else ""
-            )
-            b_content = (
-                self.diff_item.b_blob.data_stream.read().decode(
-                    "utf-8", errors="ignore"
-                )
-                if self.diff_item.b_blob
-                else ""
-            )
-
-            a_lines = a_content.splitlines() if a_content else []
-            b_lines = b_content.splitlines() if b_content else []
-
-            if not a_lines:
-                return len(b_lines), 0
-            elif not b_lines:
-                return 0, len(a_lines)
-            else:
-                return max(0, len(b_lines) - len(a_lines)), max(
-                    0, len(a_lines) - len(b_lines)
-                )
-        except Exception:
-            return 0, 0
-
 
 @dataclass(frozen=True, slots=True)
 class AggregatedDiffStats:
@@ -69,6 +56,14 @@ class AggregatedDiffStats:
     files_changed: int = 0
     hunks_count: int = 0
 
+    def to_dict(self) -> Dict[str, int]:
+        return {
+            "lines_added": self.lines_added,
+            "lines_removed": self.lines_removed,
+            "files_changed": self.files_changed,
+            "hunks_count": self.hunks_count,
+        }
+
 
 class DiffElement:
     __slots__ = (
@@ -79,6 +74,8 @@ class DiffElement:
         "metadata",
         "parent",
         "_children",
+        "_children_view",
+        "_diff",
     )
 
     def __init__(
@@ -97,25 +94,42 @@ class DiffElement:
         self.metadata = metadata
         self.parent = parent
         self._children: List["DiffElement"] = []
+        self._children_view: Optional[Tuple["DiffElement", ...]] = None
+        self._diff: Optional["Diff"] = None
 
     @property
-    def children(self):
-        return self._children.copy()
+    def children(self) -> Tuple["DiffElement", ...]:
+        # Immutable, so callers cannot bypass add_children; built once and
+        # reused until the next child is attached.
+        if self._children_view is None:
+            self._children_view = tuple(self._children)
+        return self._children_view
 
     def add_children(self, child: "DiffElement"):
         child.parent = self
         self._children.append(child)
+        self._children_view = None
+        if self._diff is not None:
+            self._diff._index(child)
+
+    def iter_children_by_type(self, element_type: DiffType) -> Iterator["DiffElement"]:
+        for child in self._children:
+            if child.element_type is element_type:
+                yield child
 
     def get_children_by_type(self, element_type: DiffType) -> List["DiffElement"]:
-        return [child for child in self._children if child.element_type == element_type]
+        return list(self.iter_children_by_type(element_type))
 
 
 class Diff:
-    __slots__ = ("commit_hexsha", "_elements")
+    __slots__ = ("commit_hexsha", "_elements", "_by_identifier", "_by_type", "_stats")
 
     def __init__(self, commit_hexsha: str) -> None:
         self.commit_hexsha = commit_hexsha
         self._elements: List[DiffElement] = []
+        self._by_identifier: Dict[str, DiffElement] = {}
+        self._by_type: DefaultDict[DiffType, List[DiffElement]] = defaultdict(list)
+        self._stats: Optional[AggregatedDiffStats] = None
 
     def __len__(self) -> int:
         return len(self._elements)
@@ -129,10 +143,12 @@ class Diff:
         return self._elements[index]
 
     @classmethod
-    def to_diff(cls, git_commit: GitCommit) -> Self:
+    def to_diff(
+        cls, git_commit: GitCommit, numstat: Optional[Dict[str, RawNumStat]] = None
+    ) -> Self:
         diff = cls(commit_hexsha=git_commit.hexsha)
 
-        file_elements = diff._load_diff_elements(git_commit)
+        file_elements = diff._load_diff_elements(git_commit, numstat)
 
         for elem in file_elements:
             if elem is not None:
@@ -140,61 +156,130 @@ class Diff:
 
         return diff
 
+    @classmethod
+    def build_many(
+        cls,
+        hexshas: Sequence[str],
+        repo_path: str,
+        numstats: Optional[Dict[str, Dict[str, RawNumStat]]] = None,
+        max_workers: int = DIFF_MAX_WORKERS,
+    ) -> List[Self]:
+        if not hexshas:
+            return []
+
+        # GitPython reads objects through one cat-file process per Repo, which
+        # is not thread-safe, so every worker thread opens its own.
+        local = threading.local()
+        repos: List[Repo] = []
+
+        def init_worker() -> None:
+            local.repo = Repo(repo_path)
+            repos.append(local.repo)
+
+        def build(hexsha: str) -> Self:
+            numstat = numstats.get(hexsha) if numstats else None
+            return cls.to_diff(local.repo.commit(hexsha), numstat)
+
+        try:
+            with ThreadPoolExecutor(
+                max_workers=max_workers, initializer=init_worker
+            ) as executor:
+                return list(executor.map(build, hexshas))
+        finally:
+            for repo in repos:
+                repo.close()
+
     def add_element(self, element: DiffElement) -> None:
         self._elements.append(element)
+        self._by_type[element.element_type].append(element)
+        self._stats = None
+        self._index(element)
 
     def walk(self) -> Iterator[DiffElement]:
-        for element in self._elements:
-            yield from self._walk(element)
+        stack = self._elements[::-1]
+        while stack:
+            element = stack.pop()
+            yield element
+            stack.extend(reversed(element._children))
 
     def get_root_elements(self) -> List[DiffElement]:
         return self._elements.copy()
 
+    def iter_by_type(self, element_type: DiffType) -> Iterator[DiffElement]:
+        return iter(self._by_type.get(element_type, ()))
+
     def get_elements_by_type(self, element_type: DiffType) -> List[DiffElement]:
-        return [elem for elem in self._elements if elem.element_type == element_type]
+        return list(self.iter_by_type(element_type))
 
     def find_element_by_identifier(self, identifier: str) -> Optional[DiffElement]:
-        for element in self._elements:
-            if element.identifier == identifier:
-                return element
-            result = self._find_in_children(element, identifier)
-            if result:
-                return result
-        return None
+        return self._by_identifier.get(identifier)
 
     def get_aggregated_stats(self) -> AggregatedDiffStats:
+        if self._stats is None:
+            self._stats = self._aggregate_stats()
+        return self._stats
+
+    def _aggregate_stats(self) -> AggregatedDiffStats:
         total_lines_added = 0
         total_lines_removed = 0
         total_hunks = 0
-        unique_files = set()
+        total_files = 0
 
-        for elem in self.get_elements_by_type(DiffType.FILE):
-            unique_files.add(elem.identifier)
-            total_lines_added += elem.stats.lines_added
-            total_lines_removed += elem.stats.lines_removed
-            total_hunks += elem.stats.hunks_count
+        # Each file element comes from one entry of the commit's diff, so its
+        # identifier is unique within the diff.
+        for elem in self.iter_by_type(DiffType.FILE):
+            stats = elem.stats
+            total_lines_added += stats.lines_added
+            total_lines_removed += stats.lines_removed
+            total_hunks += stats.hunks_count
+            total_files += 1
 
         return AggregatedDiffStats(
             lines_added=total_lines_added,
             lines_removed=total_lines_removed,
-            files_changed=len(unique_files),
+            files_changed=total_files,
             hunks_count=total_hunks,
         )
 
-    def _load_diff_elements(self, git_commit: GitCommit) -> List[DiffElement]:
-        file_elements = []
+    def _index(self, element: DiffElement) -> None:
+        stack = [element]
+        while stack:
+            element = stack.pop()
+            element._diff = self
+            self._by_identifier.setdefault(element.identifier, element)
+            stack.extend(reversed(element._children))
+
+    def _load_diff_elements(
+        self, git_commit: GitCommit, numstat: Optional[Dict[str, RawNumStat]]
+    ) -> List[Optional[DiffElement]]:
         if git_commit.parents:
             parent = git_commit.parents[0]
             git_diff = parent.diff(git_commit)
+            diff_args = (parent.hexsha, git_commit.hexsha)
         else:
             git_diff = git_commit.diff(None)
+            diff_args = (git_commit.hexsha,)
+            # Batched `git log --numstat` diffs root commits against the empty
+            # tree, not the working tree.
+            numstat = None
+
+        if numstat is None:
+            numstat = parse_numstat(
+                git_commit.repo.git.diff("--numstat", "-z", "-M", *diff_args)
+            )
 
-        for diff_item in git_diff:
-            file_element = self._create_file_element(diff_item)
-            file_elements.append(file_element)
-        return file_elements
+        create = self._create_file_element
+        return [
+            create(
+                diff_item,
+                numstat.get(diff_item.b_path or diff_item.a_path, _EMPTY_NUMSTAT),
+            )
+            for diff_item in git_diff
+        ]
 
-    def _create_file_element(self, diff_item: GitDiff) -> Optional[DiffElement]:
+    def _create_file_element(
+        self, diff_item: GitDiff, numstat: RawNumStat
+    ) -> Optional[DiffElement]:
         try:
             if diff_item.new_file:
                 change_type = ChangeType.ADDED
@@ -212,12 +297,15 @@ class Diff:
                 change_type = ChangeType.MODIFIED
                 file_path = diff_item.a_path or diff_item.b_path
 
+            if change_type is ChangeType.REMOVED and not file_path:
+                return None
+
             file_type = FileType.from_path_to_content(file_path)
-            diff_stats = DiffStats(diff_item)
+            diff_stats = DiffStats(numstat)
 
             file_metadata = FileMetadata(
                 mode=str(diff_item.b_mode) if diff_item.b_mode else None,
-                is_binary=is_binary_file(diff_item),
+                is_binary=numstat.is_binary,
                 type=file_type,
             )
 
@@ -233,20 +321,3 @@ class Diff:
 
         except Exception as e:
             return None
-
-    def _walk(self, element: DiffElement) -> Iterator[DiffElement]:
-        yield element
-        for child in element.children:
-            yield from self._walk(child)
-
-    def _find_in_children(
-        self, element: DiffElement, identifier: str
-    ) -> Optional[DiffElement]:
-        for child in element.children:
-            if child.identifier == identifier:
-                return child
-
-            result = self._find_in_children(child, identifier)
-            if result:
-                return result
-        return None
@@ -1,4 +1,5 @@
 from collections import defaultdict
+from itertools import chain
 from typing import Any, Callable, Dict, List
 
 from diffetl.transform.commit import CommitElement
@@ -32,11 +33,5 @@ class CommitGroup(defaultdict):
         return {key: len(items) for key, items in self.items()}
 
     def flatten(self) -> List[CommitElement]:
-        seen = set()
-        result = []
-        for items in self.values():
-            for ce in items:
-                if ce.hexsha not in seen:
-                    seen.add(ce.hexsha)
-                    result.append(ce)
-        return result
+        # CommitElement hashes and compares by hexsha; the first one seen is kept.
+        return list(dict.fromkeys(chain.from_iterable(self.values())))
@@ -4,9 +4,10 @@ from typing import Optional, Self
 
 from diffetl.transform._enum import IssueState
 from diffetl.transform.commit import Author
+from diffetl.utils import parse_timestamp
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class IssueElement:
     number: int
     title: str
@@ -23,14 +24,7 @@ class IssueElement:
             title=value.get("title", ""),
             description=value.get("body"),
             state=IssueState.from_issue_data(value),
-            created_at=datetime.fromisoformat(
-                value["created_at"].replace("Z", "+00:00")
-            ),
-            closed_at=datetime.fromisoformat(value["closed_at"].replace("Z", "+00:00"))
-            if value.get("closed_at")
-            else None,
-            author=Author(
-                name=value["user"]["login"],
-                email=None,
-            ),
+            created_at=parse_timestamp(value["created_at"]),
+            closed_at=parse_timestamp(value.get("closed_at")),
+            author=Author.get(value["user"]["login"], None),
         )
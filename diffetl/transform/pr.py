@@ -4,9 +4,10 @@ from typing import List, Optional, Self
 
 from diffetl.transform._enum import PRState
 from diffetl.transform.commit import Author
+from diffetl.utils import parse_timestamp
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class PullRequestRef:
     number: int
     source_repo: str
@@ -26,7 +27,7 @@ class PullRequestRef:
         )
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class PullRequestElement:
     ref: PullRequestRef
     title: str
@@ -48,16 +49,10 @@ class PullRequestElement:
             reviewers=[rew["login"] for rew in value.get("requested_reviewers", [])],
             description=value.get("body"),
             state=PRState.from_pr_data(value),
-            created_at=datetime.fromisoformat(
-                value["created_at"].replace("Z", "+00:00")
-            ),
-            merged_at=datetime.fromisoformat(value["merged_at"].replace("Z", "+00:00"))
-            if value.get("merged_at")
-            else None,
-            closed_at=datetime.fromisoformat(value["closed_at"].replace("Z", "+00:00"))
-            if value.get("closed_at")
-            else None,
-            author=Author(name=value["user"]["login"], email=None),
+            created_at=parse_timestamp(value["created_at"]),
+            merged_at=parse_timestamp(value.get("merged_at")),
+            closed_at=parse_timestamp(value.get("closed_at")),
+            author=Author.get(value["user"]["login"], None),
             target_branch=value["base"]["ref"],
             source_branch=value["head"]["ref"],
         )
@@ -1,12 +1,35 @@
-from git import Diff as GitDiff
-
-
-def is_binary_file(diff_item: GitDiff) -> bool:
-    try:
-        if hasattr(diff_item, "diff") and diff_item.diff:
-            diff_data = diff_item.diff[:1024]
-            if isinstance(diff_data, bytes):
-                return b"\x00" in diff_data
-        return False
-    except Exception:
-        return False
+from datetime import datetime
+from typing import Dict, Optional
+
+from diffetl.extract._raw import RawNumStat
+
+
+def parse_numstat(output: str) -> Dict[str, RawNumStat]:
+    files: Dict[str, RawNumStat] = {}
+    tokens = iter(output.split("\0"))
+
+    for token in tokens:
+        token = token.strip("\n")
+        if not token:
+            continue
+
+        added, removed, path = token.split("\t", 2)
+        if not path:
+            # Renames and copies are followed by "<old path>\0<new path>".
+            next(tokens)
+            path = next(tokens)
+
+        # Binary files are reported as "-\t-\t<path>".
+        is_binary = added == "-"
+        files[path] = RawNumStat(
+            lines_added=0 if is_binary else int(added),
+            lines_removed=0 if is_binary else int(removed),
+            is_binary=is_binary,
+        )
+
+    return files
+
+
+def parse_timestamp(value: Optional[str]) -> Optional[datetime]:
+    # Since Python 3.11 fromisoformat accepts GitHub's trailing "Z" directly.
+    return datetime.fromisoformat(value) if value else None
@@ -0,0 +1,23 @@
+import pytest
+
+from diffetl.transform.assessor import MessageQualityAssessor
+
+
+@pytest.mark.parametrize(
+    "message",
+    ["feat: add x", "fix(core)!: x", "feat:\xa0x", "feat:\u3000x", "\u3000feat: x"],
+)
+def test_conventional_message(message):
+    result = MessageQualityAssessor().validate_message(message)
+
+    assert result.message_is_conventional
+
+
+@pytest.mark.parametrize(
+    "message",
+    ["feat: \u3000", "feat:\xa0", "feature: x", "feat:x"],
+)
+def test_non_conventional_message(message):
+    result = MessageQualityAssessor().validate_message(message)
+
+    assert not result.message_is_conventional
@@ -0,0 +1,29 @@
+from diffetl.extract._raw import RawNumStat
+from diffetl.transform._enum import DiffType
+from diffetl.transform.diff import DiffElement, DiffStats
+
+
+def _element(identifier: str) -> DiffElement:
+    numstat = RawNumStat(lines_added=1, lines_removed=0, is_binary=False)
+    return DiffElement(DiffType.FILE, DiffStats(numstat), identifier)
+
+
+def test_children_is_reused_between_reads():
+    parent = _element("a.py")
+    parent.add_children(_element("b.py"))
+
+    assert parent.children is parent.children
+
+
+def test_children_reflects_added_child():
+    parent = _element("a.py")
+    first = _element("b.py")
+    parent.add_children(first)
+    before = parent.children
+
+    second = _element("c.py")
+    parent.add_children(second)
+
+    assert before == (first,)
+    assert parent.children == (first, second)
+    assert second.parent is parent